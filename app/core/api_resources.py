@@ -58,7 +58,7 @@ class APICollections:
     ) -> models.Action:
         response = self.action_collection.update_collection(action_id, action)
         redis_cache.set_json("action", response.id, response.dict())
-        return self.action_collection.update_collection(action_id, action)
+        return response
 
     def delete_action(self, action_id):
         response = self.action_collection.delete_collection(action_id)
@@ -86,7 +86,7 @@ class APICollections:
     def update_task(self, task_id: str, task: models.Task) -> models.Task:
         response = self.task_collection.update_collection(task_id, task)
         redis_cache.set_json("task", response.id, response.dict())
-        return self.task_collection.update_collection(task_id, task)
+        return response
 
     def delete_task(self, task_id: str):
         response = self.task_collection.delete_collection(task_id)
@@ -4,27 +4,26 @@ Models:
         - Actions - All actions that can be executed by the process controller
         - Tasks - An ordered collection of actions to execute with a configuration
         - Screen Objects - Screen objects represent text, buttons, or GUI elements
+        - Screen Data - Screen objects found in a screenshot and its image
         - Image - An image from the xvfb virtual display
-        - Json Data - Abstract object for storing JSON data
-        - Source - Represents an abstract data source stored in the file system
-        - Captured Data - Represents any form of data that can be captured as relevant data
-            for an action or task
-        - Task Rank - Used to determine how efficient it completes a goal
-        - Mouse position - Might be used in the future to track relative mouse x and y
-            coordinates for different resolutions
+        - Async Request - Urls and request bodies to fetch concurrently
     JSON resources
         - All CRUD operations for utilizing single json files
     JSON collection resources
         - All CRUD operations for utilizing collections of json files
 """
+import copy
 import datetime
-import json
 import logging
+import mmap
+import os
 import uuid
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional, Any, Union
 
-from pydantic import BaseModel, validators
+import orjson
+from pydantic import BaseModel, Field, validators
 from pydantic.types import Json
 
 from core.constants import ACTIONS, CONDITIONALS, RESULTS
@@ -34,18 +33,63 @@ resources_dir = base_dir / "resources"
 if not resources_dir.is_dir():
     resources_dir = base_dir / "core" / "resources"
 logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+MMAP_MIN_BYTES = 1024 * 1024
+
+
+def generate_id() -> str:
+    return str(uuid.uuid4())
+
+
+def generate_timestamp() -> str:
+    return datetime.datetime.now().isoformat()
+
+
+def write_json_bytes(file_path: Path, data: bytes) -> None:
+    """Writes the serialized json to a uniquely named sibling temp file and
+    renames it into place so readers never see a partially written file"""
+    tmp_path = file_path.with_name(f"{file_path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        with open(tmp_path, "wb") as tmp_file:
+            tmp_file.write(data)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def load_json_file(file_path: Path, size: Optional[int] = None) -> Any:
+    """Parses a json file, memory mapping large files so their contents are
+    not first copied into an intermediate bytes object"""
+    if size is None:
+        size = file_path.stat().st_size
+    if size < MMAP_MIN_BYTES:
+        return orjson.loads(file_path.read_bytes())
+    with open(file_path, "rb") as file, mmap.mmap(
+        file.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mapped_file, memoryview(mapped_file) as buffer:
+        return orjson.loads(buffer)
+
+
+def rehydrate(model_cls, data: dict) -> BaseModel:
+    """Builds a model from data that was validated before it was stored,
+    skipping pydantic validation"""
+    return model_cls.construct(**data)
 
 
 class ExtendedBaseModel(BaseModel):
     @classmethod
     def get_field_names(cls, alias=False):
-        return list(cls.schema(alias).get("properties").keys())
+        return [
+            field.alias if alias else name
+            for name, field in cls.__fields__.items()
+        ]
 
 
 class Action(BaseModel):
     """Actions represent the smallest process of a task that can be executed by the process controller"""
 
-    id: Optional[str] = str(uuid.uuid4())
+    id: Optional[str] = Field(default_factory=generate_id)
     function: str
     x1: Optional[int] = None
     x2: Optional[int] = None
@@ -57,7 +101,7 @@ class Action(BaseModel):
     variables: Optional[List[str]] = []
     variable_conditions: Optional[List[str]] = []
     comparison_values: Optional[List[str]] = []
-    created_at: Optional[str] = datetime.datetime.now().isoformat()
+    created_at: Optional[str] = Field(default_factory=generate_timestamp)
     time_delay: Optional[float] = 0.0
     sleep_duration: Optional[float] = 0.0
     key_pressed: Optional[str] = None
@@ -106,7 +150,7 @@ class Action(BaseModel):
 class Task(BaseModel):
     """Tasks represent a collection of actions that complete a goal or objective"""
 
-    id: Optional[str] = str(uuid.uuid4())
+    id: Optional[str] = Field(default_factory=generate_id)
     task_dependency_id: Optional[int] = None
     action_id_list: List[str] = []
     job_creation_delta_time: Optional[float] = 0.5
@@ -121,10 +165,10 @@ class ScreenObject(ExtendedBaseModel):
     """Screen objects represent text, buttons, or GUI elements that can be
     interacted with by the process controller"""
 
-    id: Optional[str] = str(uuid.uuid4())
+    id: Optional[str] = Field(default_factory=generate_id)
     type: Optional[str] = "text"
     action_id: Optional[str] = None
-    timestamp: Optional[str] = datetime.datetime.now().isoformat()
+    timestamp: Optional[str] = Field(default_factory=generate_timestamp)
     text: str = ""
     x1: int
     y1: int
@@ -137,8 +181,8 @@ class ScreenData(ExtendedBaseModel):
     screenshot is saved as a base 64 image. This is used to compare screen
     objects to the screen data to determine if an action should be executed"""
 
-    id: Optional[str] = str(uuid.uuid4())
-    timestamp: Optional[str] = datetime.datetime.now().isoformat()
+    id: Optional[str] = Field(default_factory=generate_id)
+    timestamp: Optional[str] = Field(default_factory=generate_timestamp)
     base64str: str
     screen_obj_ids: List[str]
 
@@ -147,10 +191,10 @@ class Image(ExtendedBaseModel):
     """Represents any picture image that needs to be stored via a 64 bit
     encoding to be used for comparison or other purposes in the process controller"""
 
-    id: Optional[str] = str(uuid.uuid4())
+    id: Optional[str] = Field(default_factory=generate_id)
     width: Optional[int] = 1920
     height: Optional[int] = 1080
-    timestamp: Optional[str] = datetime.datetime.now().isoformat()
+    timestamp: Optional[str] = Field(default_factory=generate_timestamp)
     is_static_position: Optional[bool] = True
     x1: Optional[int] = 0
     y1: Optional[int] = 0
@@ -174,6 +218,54 @@ class AsyncRequest(BaseModel):
                 raise ValueError(f"Invalid url: {url}")
 
 
+MODEL_FIELDS = {
+    "Image": frozenset(Image.get_field_names()),
+    "ScreenObject": frozenset(ScreenObject.get_field_names()),
+    "ScreenData": frozenset(ScreenData.get_field_names()),
+}
+RESOURCE_MODELS = {
+    "Image": (Image, resources_dir / "images"),
+    "ScreenObject": (ScreenObject, resources_dir / "screen_data"),
+    "ScreenData": (ScreenData, resources_dir / "screen_data"),
+}
+FIELD_BITS = {
+    name: 1 << index
+    for index, name in enumerate(
+        sorted(frozenset().union(*MODEL_FIELDS.values()))
+    )
+}
+MODEL_MASKS = {
+    model: sum(FIELD_BITS[name] for name in model_fields)
+    for model, model_fields in MODEL_FIELDS.items()
+}
+
+
+@lru_cache(maxsize=128)
+def match_model_name(input_keys: frozenset) -> Optional[str]:
+    """Returns the name of the model whose fields best match the input keys.
+    Resources of the same kind share a key set, so results are memoized."""
+    input_mask = 0
+    unknown_keys = 0
+    for key in input_keys:
+        field_bit = FIELD_BITS.get(key)
+        if field_bit is None:
+            unknown_keys += 1
+        else:
+            input_mask |= field_bit
+    best_match = {}
+    for model, model_mask in MODEL_MASKS.items():
+        matches = bin(model_mask & input_mask).count("1")
+        if matches == 0:
+            continue
+        union = bin(model_mask | input_mask).count("1") + unknown_keys
+        if matches == union:
+            return model
+        percent_match = matches / union
+        if percent_match > best_match.get("percent_match", 0):
+            best_match = {"model": model, "percent_match": percent_match}
+    return best_match.get("model")
+
+
 class JsonResource:
     """Abstract class for storing Images, ScreenObjects, and ScreenData"""
 
@@ -181,57 +273,24 @@ class JsonResource:
         self.obj, self.obj_dir = self.dict_to_model(resource_dict)
 
     def dict_to_model(self, input_dict: dict) -> Any:
-        all_models = {
-            "Image": Image.get_field_names(),
-            "ScreenObject": ScreenObject.get_field_names(),
-            "ScreenData": ScreenData.get_field_names(),
-        }
-        best_match = {}
-        for model, model_fields in all_models.items():
-            input_keys = input_dict.keys()
-            percent_match = len(set(model_fields) & set(input_keys)) / float(
-                len(set(model_fields) | set(input_keys))
-            )
-            new_match = {
-                "model": model,
-                "percent_match": percent_match,
-            }
-            if percent_match > 0:
-                if not best_match:
-                    best_match = new_match
-                elif percent_match > best_match.get("percent_match"):
-                    best_match = new_match
-                    if percent_match == 1:
-                        break
-
-        if not best_match:
+        best_model = match_model_name(frozenset(input_dict))
+        if not best_model:
+            return None
+        model_cls, obj_dir = RESOURCE_MODELS[best_model]
+        try:
+            return model_cls.parse_obj(input_dict), obj_dir
+        except Exception:
             return None
-        elif best_match.get("model") == "Image":
-            obj_dir = resources_dir / "images"
-            try:
-                return Image(**input_dict), obj_dir
-            except Exception:
-                return None
-        elif best_match.get("model") == "ScreenObject":
-            obj_dir = resources_dir / "screen_data"
-            try:
-                return ScreenObject(**input_dict), obj_dir
-            except Exception:
-                return None
-        elif best_match.get("model") == "ScreenData":
-            obj_dir = resources_dir / "screen_data"
-            try:
-                return ScreenData(**input_dict), obj_dir
-            except Exception:
-                return None
 
     def store_resource(self) -> dict:
         file_name = f"{self.obj.id}.json"
         file_path = self.obj_dir / file_name
         response = {"data": f"Saved: {file_name}"}
-        with open(file_path, "w", encoding="utf-8") as file:
-            json.dump(self.obj.dict(), file, indent=6)
-            logging.debug(response)
+        write_json_bytes(
+            file_path,
+            orjson.dumps(self.obj.dict(), option=orjson.OPT_INDENT_2),
+        )
+        logger.debug(response)
         return response
 
     def load_resource(self) -> dict:
@@ -240,12 +299,12 @@ class JsonResource:
         response = {"data": f"Loaded: {file_name}"}
         obj_json = None
         try:
-            with open(file_path, "r", encoding="utf-8") as file:
-                obj_json = json.loads(file.read())
-                logging.debug(obj_json)
+            obj_json = load_json_file(file_path)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Loaded resource: %r", obj_json)
         except OSError:
             response = {"data": f"File does not exist: {file_path}"}
-            logging.debug(response)
+            logger.debug(response)
         return obj_json
 
     def delete_resource(self) -> dict:
@@ -256,7 +315,7 @@ class JsonResource:
             file_path.unlink()
         except OSError:
             response = {"data": f"File does not exist: {file_path}"}
-        logging.debug(response)
+        logger.debug(response)
         return response
 
 
@@ -270,21 +329,35 @@ class JsonCollectionResource:
         self.collection_dir = (
             resources_dir / f"{test_dir}{self.model_to_str()}s"
         )
-        self.collection_dir.mkdir(exist_ok=True)
+        self.records = {}
 
     def model_to_str(self) -> str:
         return {Action: "action", Task: "task"}.get(self.model_cls)
 
+    def read_record(self, file_path: Path) -> dict:
+        """Returns a deep copy of the parsed record, only re-parsing the file
+        when it has been replaced or modified since it was last read"""
+        try:
+            stat = file_path.stat()
+        except OSError:
+            self.records.pop(file_path.stem, None)
+            raise
+        version = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        cached = self.records.get(file_path.stem)
+        if cached is None or cached[0] != version:
+            cached = (version, load_json_file(file_path, stat.st_size))
+            self.records[file_path.stem] = cached
+        return copy.deepcopy(cached[1])
+
     def get_collection(self, obj_id: str) -> dict:
         try:
             file_path = self.collection_dir / f"{obj_id}.json"
-            with open(file_path, mode="r", encoding="utf-8") as f:
-                obj = json.load(f)
-            response = obj
-            logging.debug(response)
+            response = self.read_record(file_path)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Loaded %s: %r", self.model_to_str(), response)
         except OSError:
             response = {"data": f"{self.model_to_str()} not found."}
-            logging.debug(response)
+            logger.debug(response)
         return response
 
     def add_collection(
@@ -293,19 +366,19 @@ class JsonCollectionResource:
         try:
             if not isinstance(obj, self.model_cls):
                 obj = self.model_cls(**obj)
-            ids = [
-                file_path.name for file_path in self.collection_dir.iterdir()
-            ]
-            while f"{obj.id}.json" in ids:
-                obj.id = str(uuid.uuid4())
+            self.collection_dir.mkdir(exist_ok=True)
             file_path = self.collection_dir / f"{obj.id}.json"
-            with open(file_path, mode="w", encoding="utf-8") as f:
-                json.dump(obj.dict(), f, indent=6)
+            while file_path.exists():
+                obj.id = generate_id()
+                file_path = self.collection_dir / f"{obj.id}.json"
+            write_json_bytes(file_path, orjson.dumps(obj.dict()))
+            self.records.pop(obj.id, None)
             response = obj
-            logging.debug(response)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Added %s: %r", self.model_to_str(), response)
         except OSError:
             response = {f"Error adding {self.model_to_str()} with id: {obj.id}"}
-            logging.debug(response)
+            logger.debug(response)
         return response
 
     def update_collection(
@@ -313,6 +386,7 @@ class JsonCollectionResource:
     ) -> Union[Action, Task]:
         response = {f"Error adding {self.model_to_str()} with id: {obj.id}"}
         try:
+            self.collection_dir.mkdir(exist_ok=True)
             ids = [filename for filename in self.collection_dir.iterdir()]
             if type(obj) is not Action:
                 counter = 1
@@ -320,32 +394,40 @@ class JsonCollectionResource:
                     obj.id = f"{obj.id}-{counter}"
                     counter += 1
             file_path = self.collection_dir / f"{obj.id}.json"
-            with open(file_path, mode="w", encoding="utf-8") as f:
-                json.dump(obj.dict(), f, indent=6)
+            write_json_bytes(file_path, orjson.dumps(obj.dict()))
+            self.records.pop(obj.id, None)
             if obj_id != obj.id:
                 old_file_path = self.collection_dir / obj_id
                 old_file_path.unlink(missing_ok=True)
+                self.records.pop(obj_id, None)
             response = obj
-            logging.debug(f"Updated {self.model_to_str()} with id: {obj.id}")
+            logger.debug("Updated %s with id: %s", self.model_to_str(), obj.id)
         except OSError:
             response = {f"Error adding {self.model_to_str()} with id: {obj.id}"}
-            logging.debug(response)
+            logger.debug(response)
         return response
 
+    def has_collection(self, obj_id: str) -> bool:
+        return (self.collection_dir / f"{obj_id}.json").is_file()
+
     def get_all_collections(self):
-        return {
-            file_path.name.replace(".json", ""): json.load(open(file_path))
-            for file_path in self.collection_dir.iterdir()
+        collections = {
+            file_path.stem: self.read_record(file_path)
+            for file_path in self.collection_dir.glob("*.json")
         }
+        for obj_id in self.records.keys() - collections.keys():
+            del self.records[obj_id]
+        return collections
 
     def delete_collection(self, obj_id: str) -> dict:
         response = {"data": f"Deleted {self.model_to_str()} with id: {obj_id}"}
         try:
             file_path = self.collection_dir / f"{obj_id}.json"
             file_path.unlink()
+            self.records.pop(obj_id, None)
         except FileNotFoundError:
             response = {
                 "data": f"{self.model_to_str()} does not exist: {obj_id}"
             }
-        logging.debug(response)
+        logger.debug(response)
         return response
@@ -594,6 +594,9 @@ def capture_screen_data(
     screen_obj_ids = []
     screen_obj_values = []
     english_dict = enchant.Dict("en_US")
+    action_exists = api_resources.storage.action_collection.has_collection(
+        action_id
+    )
     for index, word_data in enumerate(img_data.splitlines()):
         """This loops through all words and numbers found within the region
         and stores in screen_object json files."""
@@ -612,19 +615,8 @@ def capture_screen_data(
                     int(word[8]),
                     int(word[9]),
                 )
-                if (
-                    action_id
-                    in api_resources.storage.action_collection.get_all_collections()
-                ):
-                    word_action_id = action_id
-                else:
-                    word_action_id = None
-                data_type = (
-                    "button"
-                    if action_id
-                    in api_resources.storage.action_collection.get_all_collections()
-                    else "text"
-                )
+                word_action_id = action_id if action_exists else None
+                data_type = "button" if action_exists else "text"
                 """Screen objects are data that store information from 
                     GUI elements and/or actions"""
                 screen_object_json = {
@@ -677,10 +669,7 @@ def capture_screen_data(
             "screen_obj_ids": screen_obj_ids,
         }
         return test_result_dict
-    elif (
-        action_id
-        not in api_resources.storage.action_collection.get_all_collections()
-    ):
+    elif not action_exists:
         """Create new action"""
         variables = [
             ", ".join(screen_obj_ids),
@@ -717,17 +706,16 @@ def screen_snip(
 ) -> dict:
     """This function is used to capture a section of the screen and
     store in resources/images as png and json files"""
-    base64str = image.base64str
-    decoded64str = base64.b64decode(base64str)
+    decoded64str = base64.b64decode(image.base64str)
     image_id = uuid.uuid4()
-    image_path = str(image_dir / f"{image_id}.png")
-    with open(image_path, "wb") as f:
-        f.write(decoded64str)
-    img = cv2.imread(image_path)
-    cv2.imwrite(image_path, img[y1:y2, x1:x2, :])
-    snip_img = cv2.imread(image_path)
-    snip_png_img = cv2.imencode(".png", snip_img)
-    b64_string = base64.b64encode(snip_png_img[1]).decode("utf-8")
+    image_path = image_dir / f"{image_id}.png"
+    img = cv2.imdecode(
+        np.frombuffer(decoded64str, dtype=np.uint8), cv2.IMREAD_COLOR
+    )
+    snip_img = img[y1:y2, x1:x2, :]
+    snip_png_img = cv2.imencode(".png", snip_img)[1].tobytes()
+    image_path.write_bytes(snip_png_img)
+    b64_string = base64.b64encode(snip_png_img).decode("utf-8")
     height = snip_img.shape[0]
     width = snip_img.shape[1]
     """Build json object"""
@@ -6,6 +6,8 @@ def clear_all_collections():
     resources_dir = base_dir / "app" / "core" / "resources"
     for collection in ("actions", "tasks"):
         collection_dir = resources_dir / collection
+        if not collection_dir.is_dir():
+            continue
         for file_path in collection_dir.iterdir():
             file_path.unlink()
 
@@ -229,8 +229,8 @@ class ModelMixin:
     @classmethod
     def teardown_class(cls):
         redis_cache.rc.flushdb()
-        rmtree(cls.action_collection.collection_dir)
-        rmtree(cls.task_collection.collection_dir)
+        rmtree(cls.action_collection.collection_dir, ignore_errors=True)
+        rmtree(cls.task_collection.collection_dir, ignore_errors=True)
         file_types = ["png", "json"]
         for image_id in cls.delete_image_files:
             for file_type in file_types:
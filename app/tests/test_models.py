@@ -3,7 +3,7 @@ from pathlib import Path
 from shutil import rmtree
 import uuid
 
-from core.models import Action, Task, JsonCollectionResource
+from core.models import Action, Task, JsonCollectionResource, match_model_name
 
 
 class TestModels:
@@ -36,8 +36,8 @@ class TestModels:
 
     @classmethod
     def teardown_method(cls):
-        rmtree(cls.action_collection.collection_dir)
-        rmtree(cls.task_collection.collection_dir)
+        rmtree(cls.action_collection.collection_dir, ignore_errors=True)
+        rmtree(cls.task_collection.collection_dir, ignore_errors=True)
 
     def test_json_collection_resource(self):
         test_action_obj1 = Action(**self.test_action1)
@@ -56,3 +56,68 @@ class TestModels:
         assert set(self.task_collection.get_collection(self.task_id)) >= set(
             self.test_task
         )
+        assert self.action_collection.has_collection(self.action_id1)
+        assert not self.action_collection.has_collection(self.task_id)
+
+    def test_model_defaults_are_generated_per_instance(self):
+        test_action_obj1 = Action(function="click")
+        test_action_obj2 = Action(function="click")
+        assert test_action_obj1.id != test_action_obj2.id
+        assert Task().id != Task().id
+
+    def test_get_collection_after_update(self):
+        action_collection = JsonCollectionResource(Action, True)
+        test_action_obj = Action(**self.test_action1)
+        action_collection.add_collection(test_action_obj)
+        test_action = action_collection.get_collection(self.action_id1)
+        assert test_action["function"] == "move_to"
+        test_action_obj.function = "click"
+        action_collection.update_collection(self.action_id1, test_action_obj)
+        test_action = action_collection.get_collection(self.action_id1)
+        assert test_action["function"] == "click"
+        test_action["images"].append("test_image.png")
+        test_action = action_collection.get_collection(self.action_id1)
+        assert test_action["images"] == []
+        action_collection.delete_collection(self.action_id1)
+        assert "data" in action_collection.get_collection(self.action_id1)
+
+    def test_match_model_name(self):
+        image = {
+            "id": "test_image",
+            "width": 132,
+            "height": 32,
+            "x1": 0,
+            "y1": 0,
+            "x2": 132,
+            "y2": 32,
+            "base64str": "",
+        }
+        screen_object = {
+            "id": "test_screen_object",
+            "type": "text",
+            "action_id": None,
+            "text": "test",
+            "x1": 0,
+            "y1": 0,
+            "x2": 132,
+            "y2": 32,
+        }
+        screen_data = {
+            "id": "test_screen_data",
+            "base64str": "",
+            "screen_obj_ids": [],
+        }
+        unknown_keys = {"function": "click", "variables": []}
+        assert match_model_name(frozenset(image)) == "Image"
+        assert match_model_name(frozenset(screen_object)) == "ScreenObject"
+        assert match_model_name(frozenset(screen_data)) == "ScreenData"
+        assert match_model_name(frozenset({**image, **unknown_keys})) == "Image"
+        assert (
+            match_model_name(frozenset({**screen_object, **unknown_keys}))
+            == "ScreenObject"
+        )
+        assert (
+            match_model_name(frozenset({**screen_data, **unknown_keys}))
+            == "ScreenData"
+        )
+        assert match_model_name(frozenset(unknown_keys)) is None